@@ -1,4 +1,4 @@
-f="""
+"""
 =============================================================================
 AI STORY GENERATION MODULE
 =============================================================================
@@ -6,156 +6,198 @@ This module provides two main functions:
 1. Generate creative stories from images using Google Gemini AI
 2. Convert generated stories into natural-sounding speech audio
 
-Dependencies: google-generativeai, python-dotenv, Pillow
+Dependencies: google-generativeai, python-dotenv, diskcache
 =============================================================================
 """
 
 # 1. --- Importing libraries ---
 
-f="""
-Each import serves a specific purpose:
-1. dotenv.load_dotenv - Loads environment variables from .env file
-2. google.genai - Main Google Generative AI SDK for accessing Gemini models
-3. google.genai.types - Type definitions for configuring API requests
-4. io.BytesIO - Creates file-like objects in memory (for audio processing)
-5. tempfile - Creates temporary files that auto-delete after use
-6. wave - Python's built-in library for reading/writing WAV audio files
-7. os - Operating system interface (for accessing environment variables)
-"""
+# Each import serves a specific purpose:
+# 1. dotenv.load_dotenv - Loads environment variables from .env file
+# 2. google.genai - Main Google Generative AI SDK for accessing Gemini models
+# 3. google.genai.types - Type definitions for configuring API requests
+# 4. diskcache - Disk-backed dictionary for saving generated stories and audio
+# 5. httpx - HTTP library used by google-genai (connection pool limits)
+# 6. concurrent.futures - Thread pool that runs several TTS requests at once
+# 7. functools - lru_cache keeps the client after first use
+# 8. hashlib - Builds SHA-256 fingerprints of images/text for cache keys
+# 9. re - Splits over-long paragraphs between sentences for TTS
+# 10. shutil - Copies cached audio files in blocks (no full read into memory)
+# 11. struct - Packs the 44-byte WAV header in front of raw PCM audio
+# 12. tempfile - Creates temporary files that auto-delete after use
+# 13. logging - Reports warnings/errors through the app's log handlers
+#     (logger is this module's named logger)
+# 14. os - Operating system interface (environment variables, deleting empty files)
 
 from dotenv import load_dotenv
 import google.genai as genai
 from google.genai import types
-from io import BytesIO
+import diskcache
+import httpx
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import functools
+import hashlib
+import re
+import shutil
+import struct
 import tempfile
-import wave
+import logging
 import os
 
-# 2. --- Load API keys from .env file ---
-
-f="""
-What this does:
-1. Looks for a file named ".env" in the current directory
-2. Reads all variables in format: VARIABLE_NAME=value
-3. Makes them available via os.getenv() function
-4. Keeps sensitive data (API keys) out of source code
-
-Example .env file content:
-GOOGLE_API_KEY=xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+logger = logging.getLogger(__name__)
 
-Security benefit:
-- .env file is added to .gitignore (not uploaded to GitHub)
-- API keys remain private and secure
-"""
+# 2. --- Load API keys from .env file ---
 
-load_dotenv()
+# What this does:
+# 1. Looks for a file named ".env" in the current directory
+# 2. Reads all variables in format: VARIABLE_NAME=value
+# 3. Makes them available via os.getenv() function
+# 4. Keeps sensitive data (API keys) out of source code
+#
+# Example .env file content:
+# GOOGLE_API_KEY=xxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxxx
+#
+# Security benefit:
+# - .env file is added to .gitignore (not uploaded to GitHub)
+# - API keys remain private and secure
+#
+# Runs inside get_client() (section 5), only once per process.
 
 # 3. --- Fetch Google API key securely ---
 
-f="""
-Process:
-1. os.getenv("GOOGLE_API_KEY") searches for this environment variable
-2. Returns the value as a string if found
-3. Returns None if variable doesn't exist
-4. Stored in variable 'api_key' for later use
-
-Why use environment variables?
-- Never hardcode API keys in source code
-- Different keys for development/production
-- Easy to change without modifying code
-"""
-
-api_key = os.getenv("GOOGLE_API_KEY")
+# Process:
+# 1. os.getenv("GOOGLE_API_KEY") searches for this environment variable
+# 2. Returns the value as a string if found
+# 3. Returns None if variable doesn't exist
+# 4. Stored in variable 'api_key' for later use
+#
+# Why use environment variables?
+# - Never hardcode API keys in source code
+# - Different keys for development/production
+# - Easy to change without modifying code
+#
+# Runs inside get_client() (section 5), right after load_dotenv().
 
 # 4. --- Validate API key exists, raise error if missing to prevent API call failures ---
 
-f="""
-Validation logic:
-1. "if not api_key" checks if api_key is None or empty string
-2. Both None and "" are "falsy" values in Python
-3. If falsy, raise ValueError exception
-4. ValueError stops program execution immediately
-5. Prevents API calls without proper authentication
-
-This is a "fail-fast" approach:
-- Better to crash early with clear error message
-- Than to fail later with cryptic API authentication errors
-"""
-
-if not api_key:
-    raise ValueError("!!!API KEY NOT FOUND!!!")
+# Validation logic:
+# 1. "if not api_key" checks if api_key is None or empty string
+# 2. Both None and "" are "falsy" values in Python
+# 3. If falsy, raise ValueError exception
+# 4. ValueError stops program execution immediately
+# 5. Prevents API calls without proper authentication
+#
+# This is a "fail-fast" approach:
+# - Better to crash early with clear error message
+# - Than to fail later with cryptic API authentication errors
+#
+# Runs inside get_client() (section 5), so the error appears on the
+# first story/audio request (shown in the app) instead of on import.
 
 # 5. --- Initialize the Gemini client using the provided API key ---
 
-f="""
-What this creates:
-1. genai.Client() creates an authenticated connection to Google's API
-2. api_key parameter provides authentication credentials
-3. Client object is stored in 'client' variable
-4. This client will be used for all API calls (story & audio generation)
-
-The client object provides access to:
-- Text generation models (Gemini Pro)
-- Vision models (for image analysis)
-- Text-to-Speech models (for audio)
-- Chat models (for conversations)
-"""
-
-client = genai.Client(api_key=api_key)
+# What this creates:
+# 1. get_client() loads .env, reads and validates the API key (sections 2-4)
+# 2. genai.Client() creates an authenticated connection to Google's API
+# 3. @functools.lru_cache(maxsize=1) remembers the client after the first
+#    call, so .env is read and the connection pool is built only once
+# 4. Every API call (story & audio generation) uses get_client()
+#
+# The client object provides access to:
+# - Text generation models (Gemini Pro)
+# - Vision models (for image analysis)
+# - Text-to-Speech models (for audio)
+# - Chat models (for conversations)
+#
+# HTTP connection settings (http_options):
+# 1. timeout - 120 seconds per request (in milliseconds), long stories take time
+# 2. HTTP_LIMITS - connection pool for the underlying httpx clients
+#    * max_connections: up to 64 requests can be open at the same time
+#    * max_keepalive_connections: up to 32 idle connections are kept open
+#      and reused, so parallel paragraph narration doesn't pay for a new
+#      TCP/TLS handshake on every request
+# 3. http2 - HTTP/2 lets many parallel requests share one TLS connection
+#    (httpx needs the "h2" package for it, listed in requirements.txt)
+# 4. client_args - applies these settings to the client's httpx pool
+# 5. HTTP_RETRY - retries temporary Gemini failures automatically
+#    * 429 (rate limit) and 500/502/503/504 (server errors)
+#    * up to 4 attempts in total
+#    * waits 1s, 2s, 4s ... (max 10s) plus random jitter, so many
+#      clients don't retry at exactly the same moment
+#    * the SDK runs these retries itself (tenacity under the hood)
+
+HTTP_TIMEOUT_MS = 120_000
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+HTTP_RETRY = types.HttpRetryOptions(
+    attempts=4,
+    initial_delay=1.0,
+    max_delay=10.0,
+    jitter=1.0,
+    http_status_codes=[429, 500, 502, 503, 504]
+)
+
+@functools.lru_cache(maxsize=1)
+def get_client():
+    load_dotenv()
+    api_key = os.getenv("GOOGLE_API_KEY")
+
+    if not api_key:
+        raise ValueError("!!!API KEY NOT FOUND!!!")
+
+    return genai.Client(
+        api_key=api_key,
+        http_options=types.HttpOptions(
+            timeout=HTTP_TIMEOUT_MS,
+            client_args={"limits": HTTP_LIMITS, "http2": True},
+            retry_options=HTTP_RETRY
+        )
+    )
 
 # 6. --- Initialize the Gemini Model for Text and Speech generation ---
 
-f="""
-Two different models for two different purposes:
-
-MODEL 1: gemini-2.5-pro
-- Purpose: Generate creative story text from images
-- Capabilities:
-  * Analyzes multiple images simultaneously
-  * Understands context and relationships between images
-  * Writes coherent, creative narratives
-  * Supports multimodal input (text + images)
-- "Pro" means: Higher quality, more capable (but slower & costlier)
-
-MODEL 2: gemini-2.5-flash-preview-tts
-- Purpose: Convert text to natural-sounding speech
-- Capabilities:
-  * Text-to-Speech (TTS) synthesis
-  * Multiple voice options
-  * Natural prosody and intonation
-  * Returns raw audio data
-- "Flash" means: Faster response, optimized for speed
-- "preview" means: Still in testing, may change
-- "tts" means: Text-To-Speech specialized model
-"""
+# Two different models for two different purposes:
+#
+# MODEL 1: gemini-2.5-pro
+# - Purpose: Generate creative story text from images
+# - Capabilities:
+#   * Analyzes multiple images simultaneously
+#   * Understands context and relationships between images
+#   * Writes coherent, creative narratives
+#   * Supports multimodal input (text + images)
+# - "Pro" means: Higher quality, more capable (but slower & costlier)
+#
+# MODEL 2: gemini-2.5-flash-preview-tts
+# - Purpose: Convert text to natural-sounding speech
+# - Capabilities:
+#   * Text-to-Speech (TTS) synthesis
+#   * Multiple voice options
+#   * Natural prosody and intonation
+#   * Returns raw audio data
+# - "Flash" means: Faster response, optimized for speed
+# - "preview" means: Still in testing, may change
+# - "tts" means: Text-To-Speech specialized model
 
 model_name_1 = 'gemini-2.5-pro'
 model_name_2 = 'gemini-2.5-flash-preview-tts'
 
-# 7. --- Function to define prompt ---
-
-f="""
-Function: story_prompt(story_type)
-
-Purpose:
-    Generates comprehensive instructions for the AI to create a story
-
-Parameter:
-    story_type (str) - Genre of story (e.g., "Comedy", "Horror", "Adventure")
-
-Returns:
-    str - Multi-line prompt with all instructions for the AI
-
-Why we need this function:
-    - AI models need clear, detailed instructions
-    - Better prompts = better story quality
-    - Reusable across different story types
-    - Maintains consistent story structure
-"""
-
-def story_prompt(story_type):
-    prompt = f"""
-        You are a professional and skilled storyteller. Your job is to write a **{story_type} story** using the uploaded images as your inspiration.
+# 7. --- Static story instructions (system instruction) ---
+
+# STORY_RULES holds every instruction that never changes between requests:
+#     - The storyteller role
+#     - Rules 1-7 (structure, tone table, language, length)
+#
+# Why keep it separate from the story type?
+#     - This block is the same for every click, only the genre changes
+#     - It is sent as the system instruction, so it always comes first in
+#       the request and Gemini's automatic (implicit) prefix caching can
+#       reuse it between requests
+#     - Explicit context caching is not used: this block is far below the
+#       minimum size Gemini accepts for a cache
+#
+# STORY_CONFIG is the request config shared by every story request.
+
+STORY_RULES = """
+        You are a professional and skilled storyteller. Your job is to write a story of the genre requested by the user, using the uploaded images as your inspiration.
         Use simple and easy to understand english
         **Instructions:**
         1. Look carefully at all the uploaded images. Imagine what could be happening in each one.  
@@ -179,129 +221,466 @@ def story_prompt(story_type):
         5. Don't describe the images directly. Instead, **turn what you see into a smooth story** that feels natural and human.  
         6. Write in **simple, clear, and beautiful English** that anyone can enjoy reading.  
         7. The story should be **500-700 words** long and **feel complete**.
+        """
 
-        Now write the full story using these images as inspiration.
+STORY_CONFIG = types.GenerateContentConfig(system_instruction=STORY_RULES)
+
+# 8. --- Function to define prompt ---
+
+# Function: story_prompt(story_type)
+#
+# Purpose:
+#     Generates the small per-request instruction for the AI
+#
+# Parameter:
+#     story_type (str) - Genre of story (e.g., "Comedy", "Horror", "Adventure")
+#
+# Returns:
+#     str - One line naming the genre to write
+#
+# Why we need this function:
+#     - All fixed rules live in STORY_RULES (sent as the system instruction)
+#     - Only the genre changes between requests
+#     - Keeps each request as small as possible
+#
+# PROMPT_TEMPLATE / PROMPT_HEAD / PROMPT_TAIL:
+#     - The template has exactly one placeholder, {story_type}
+#     - It is split around the placeholder once, at import
+#     - story_prompt() then only joins three strings, no formatting
+#
+# GENRES / PROMPTS:
+#     - GENRES lists the 10 story types offered in the app dropdown
+#     - PROMPTS builds the prompt for every genre once, at import
+#     - get_prompt(story_type) is then just a dictionary lookup
+#       (any other genre falls back to story_prompt())
+
+PROMPT_TEMPLATE = """
+        Now write the full **{story_type} story** using these images as inspiration.
         """
-    
-    return prompt
 
-# 8. --- Function to generate story ---
+PROMPT_HEAD, PROMPT_TAIL = PROMPT_TEMPLATE.split("{story_type}")
 
-f="""
-Function: generate_story_from_images(images, story_type)
+def story_prompt(story_type):
+    return PROMPT_HEAD + story_type + PROMPT_TAIL
+
+GENRES = (
+    "Comedy",
+    "Thriller",
+    "Moral",
+    "Horror",
+    "Emotional",
+    "Adventurous",
+    "Action",
+    "Mysterious",
+    "Fantasy",
+    "Fairy Tale"
+)
+
+PROMPTS = {genre: story_prompt(genre) for genre in GENRES}
+
+def get_prompt(story_type):
+    return PROMPTS.get(story_type) or story_prompt(story_type)
+
+# 9. --- Local cache for generated stories and audio ---
+
+# result_cache is a small database on disk (diskcache) that remembers
+# every story and audio clip we already paid for.
+#
+# Keys (SHA-256 fingerprints):
+#     story_cache_key(images, story_type)
+#         - MIME type and encoded bytes of every image (in upload order,
+#           because the story follows the image order)
+#         - the story type and the story model name
+#     audio_cache_key(story_text)
+#         - the story text, the voice name and the TTS model name
+#
+# Why?
+#     - Clicking "Generate Story" again with the same images and genre
+#       returns instantly instead of waiting for Gemini
+#     - Re-generating audio for an unchanged story costs nothing
+#     - Stored on disk, so it survives app restarts
+
+AUDIO_VOICE = "Kore"
+
+result_cache = diskcache.Cache(os.path.join(tempfile.gettempdir(), "story_cache"))
+
+def story_cache_key(images, story_type):
+    digest = hashlib.sha256()
+    digest.update(model_name_1.encode())
+
+    for image in images:
+        digest.update(image.inline_data.mime_type.encode())
+        digest.update(image.inline_data.data)
+
+    digest.update(story_type.encode())
+
+    return "story:" + digest.hexdigest()
+
+def audio_cache_key(story_text):
+    digest = hashlib.sha256()
+    digest.update(f"{model_name_2}:{AUDIO_VOICE}:".encode())
+    digest.update(story_text.encode())
+
+    return "audio:" + digest.hexdigest()
+
+# 10. --- Function to generate story ---
+
+# Function: generate_story_from_images(images, story_type)
+#
+# Purpose:
+#     Sends images to Gemini AI and receives a generated story
+#
+# Parameters:
+#     images (list) - List of image Parts (types.Part with JPEG bytes)
+#     story_type (str) - Genre of story to generate
+#
+# Returns:
+#     str - Complete generated story text
+#
+# Process Flow:
+#     1. Receive images and story type from user
+#     2. Return the saved story if these images + genre were seen before
+#     3. Send one flat list (each image Part, then the short genre prompt),
+#        with STORY_RULES as the system instruction
+#     4. Save the story in result_cache, then return the generated text
 
-Purpose:
-    Sends images to Gemini AI and receives a generated story
+def generate_story_from_images(images, story_type):
+    key = story_cache_key(images, story_type)
+    if key in result_cache:
+        return result_cache[key]
 
-Parameters:
-    images (list) - List of PIL Image objects to analyze
-    story_type (str) - Genre of story to generate
+    response = get_client().models.generate_content(
+        model=model_name_1,
+        contents=[*images, get_prompt(story_type)],
+        config=STORY_CONFIG
+    )
 
-Returns:
-    str - Complete generated story text
+    if response.text:
+        result_cache[key] = response.text
 
-Process Flow:
-    1. Receive images and story type from user
-    2. Create detailed prompt using story_prompt() function
-    3. Send both images and prompt to Gemini API
-    4. Wait for AI to analyze images and write story
-    5. Extract and return the generated text
-"""
+    return response.text
 
-def generate_story_from_images(images, story_type):
-    response = client.models.generate_content(
-        model=model_name_1,
-        contents=[images, story_prompt(story_type)]
+# 11. --- Function to build the WAV header ---
+
+# Function: wav_header(data_size)
+#
+# Purpose:
+#     Builds the 44-byte RIFF/WAVE header that goes in front of raw PCM audio
+#
+# Parameter:
+#     data_size (int) - Number of PCM bytes that follow the header
+#
+# Returns:
+#     bytes - The 44-byte header
+#
+# Why build it by hand?
+#     - Gemini TTS always returns the same format: 24 kHz, mono, 16-bit
+#     - A WAV file is just this fixed header + the raw samples
+#     - struct.pack writes it in one step, no wave module bookkeeping
+#
+# Header layout (little-endian, '<'):
+#     'RIFF', file size - 8, 'WAVE',
+#     'fmt ', 16 (fmt size), 1 (PCM), channels, sample rate,
+#     byte rate, block align, bits per sample,
+#     'data', data_size
+
+AUDIO_SAMPLE_RATE = 24000   # Sample rate from mime_type (rate=24000)
+AUDIO_CHANNELS = 1          # Mono
+AUDIO_SAMPLE_WIDTH = 2      # 16-bit (L16 = Linear 16-bit PCM)
+WAV_HEADER_SIZE = 44
+
+def wav_header(data_size):
+    return struct.pack(
+        '<4sI4s4sIHHIIHH4sI',
+        b'RIFF', WAV_HEADER_SIZE - 8 + data_size, b'WAVE',
+        b'fmt ', 16, 1, AUDIO_CHANNELS, AUDIO_SAMPLE_RATE,
+        AUDIO_SAMPLE_RATE * AUDIO_CHANNELS * AUDIO_SAMPLE_WIDTH,
+        AUDIO_CHANNELS * AUDIO_SAMPLE_WIDTH, AUDIO_SAMPLE_WIDTH * 8,
+        b'data', data_size
     )
 
-    return response.text
+# 12. --- Functions for parallel paragraph narration ---
+
+# The TTS model reads text one piece after another, so one long request
+# takes time in proportion to the story length. Paragraphs are independent,
+# so they can be narrated by separate requests running at the same time.
+#
+# TTS_CONFIG
+#     Request settings shared by every TTS call (audio output, "Kore" voice)
+#
+# audio_from_response(response)
+#     Returns the raw PCM bytes of a (streamed or normal) TTS response,
+#     or None when the response carries only metadata
+#
+# split_story_paragraphs(story_text)
+#     Splits the story on blank lines and drops empty paragraphs
+#     - A paragraph longer than MAX_TTS_CHARS is split again between
+#       sentences (and, for one giant sentence, at the character limit)
+#     - The TTS model cuts off or rejects longer input only after the
+#       whole request, so every piece is kept under the limit up front
+#
+# synthesize_paragraph(paragraph)
+#     Narrates one paragraph with the normal (sync) client, returns PCM bytes
+#     - Raises ValueError if no audio comes back, so a paragraph is never
+#       silently missing from the narration
+#
+# synthesize_paragraphs(paragraphs, on_progress=None)
+#     Narrates all paragraphs in parallel on a thread pool
+#     - At most MAX_TTS_WORKERS requests run at the same time
+#     - The sync client is safe to share between threads; the async
+#       client is not used because its connections belong to one event
+#       loop and would break on the next asyncio.run()
+#     - Results come back in paragraph order
+#     - on_progress gets the seconds of audio finished so far, each
+#       time one paragraph is done
+#
+# PARAGRAPH_PAUSE
+#     0.3 seconds of silence (zero samples) placed between paragraphs
+#     so the narration has a natural pause
+
+TTS_CONFIG = types.GenerateContentConfig(
+    response_modalities=["AUDIO"],
+    speech_config=types.SpeechConfig(
+        voice_config=types.VoiceConfig(
+            prebuilt_voice_config=types.PrebuiltVoiceConfig(
+                voice_name=AUDIO_VOICE
+            )
+        )
+    )
+)
 
-# 9. --- function to generate audio ---
+AUDIO_BYTES_PER_SECOND = AUDIO_SAMPLE_RATE * AUDIO_CHANNELS * AUDIO_SAMPLE_WIDTH
+PARAGRAPH_PAUSE_SECONDS = 0.3
+PARAGRAPH_PAUSE = b"\x00" * (int(AUDIO_SAMPLE_RATE * PARAGRAPH_PAUSE_SECONDS) * AUDIO_CHANNELS * AUDIO_SAMPLE_WIDTH)
 
-f="""
-Function: generate_audio_from_generated_story(story_text)
+def audio_from_response(response):
+    if not response.candidates or not response.candidates[0].content or not response.candidates[0].content.parts:
+        return None
 
-Purpose:
-    Converts story text into natural-sounding speech audio file
+    audio_part = response.candidates[0].content.parts[0]
+    if audio_part.inline_data is None:
+        return None
 
-Parameter:
-    story_text (str) - The story text to convert to speech
+    # audio data is already bytes (not base64 string)
+    return audio_part.inline_data.data
 
-Returns:
-    str - File path to temporary WAV audio file
-    None - If generation fails
+MAX_TTS_CHARS = 4800
 
-Process Overview:
-    1. Validate and truncate text if too long
-    2. Send text to Gemini TTS model
-    3. Receive raw PCM audio data
-    4. Convert PCM to WAV format (add headers)
-    5. Save to temporary file
-    6. Return file path for playback
+def split_long_paragraph(paragraph):
+    pieces = []
+    current = ""
 
-Technical Challenge Solved:
-    Gemini returns raw PCM audio (just the samples)
-    But browsers need WAV format (samples + headers)
-    This function bridges that gap
-"""
+    for sentence in re.split(r"(?<=[.!?])\s+", paragraph):
+        # A single sentence above the limit is cut into fixed-size slices
+        while len(sentence) > MAX_TTS_CHARS:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(sentence[:MAX_TTS_CHARS])
+            sentence = sentence[MAX_TTS_CHARS:]
+
+        if current and len(current) + 1 + len(sentence) > MAX_TTS_CHARS:
+            pieces.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+
+    if current:
+        pieces.append(current)
+
+    return pieces
+
+def split_story_paragraphs(story_text):
+    paragraphs = []
+
+    for paragraph in story_text.split("\n\n"):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+
+        if len(paragraph) > MAX_TTS_CHARS:
+            paragraphs.extend(split_long_paragraph(paragraph))
+        else:
+            paragraphs.append(paragraph)
+
+    return paragraphs
+
+MAX_TTS_WORKERS = 8
 
-def generate_audio_from_generated_story(story_text: str):
-    f="""
-    Generate speech from the story using Gemini and return audio file.
-    Converts raw PCM to WAV format for playback.
+def synthesize_paragraph(paragraph):
+    response = get_client().models.generate_content(
+        model=model_name_2,
+        contents=[paragraph],
+        config=TTS_CONFIG
+    )
+
+    audio_data = audio_from_response(response)
+    if not audio_data:
+        raise ValueError(f"No audio returned for paragraph starting: {paragraph[:40]!r}")
+
+    return audio_data
+
+def synthesize_paragraphs(paragraphs, on_progress=None):
+    seconds_done = 0.0
+
+    with ThreadPoolExecutor(max_workers=min(len(paragraphs), MAX_TTS_WORKERS)) as executor:
+        futures = [executor.submit(synthesize_paragraph, paragraph) for paragraph in paragraphs]
+
+        # Progress is reported from this (the Streamlit) thread, never
+        # from a worker, as each paragraph finishes
+        for future in as_completed(futures):
+            try:
+                audio_data = future.result()
+            except Exception:
+                # Don't keep paying for the rest once one paragraph failed
+                for pending in futures:
+                    pending.cancel()
+                raise
+
+            seconds_done += len(audio_data) / AUDIO_BYTES_PER_SECOND
+
+            if on_progress:
+                on_progress(seconds_done)
+
+    return [future.result() for future in futures]
+
+# 13. --- Temporary audio file location ---
+
+# The narration WAV (2-5 MB) only lives until Streamlit has played it,
+# so it does not need to be written to a real disk.
+#
+# AUDIO_TEMP_DIR:
+#     - /dev/shm is a RAM-backed folder (tmpfs) on Linux
+#     - Used when it exists and is writable
+#     - Otherwise None, which means the normal temp folder (macOS, Windows)
+#
+# audio_temp_file():
+#     Opens a new .wav temp file in AUDIO_TEMP_DIR; it keeps a normal path,
+#     so st.audio can read it and os.unlink can remove it later
+
+SHARED_MEMORY_DIR = "/dev/shm"
+AUDIO_TEMP_DIR = SHARED_MEMORY_DIR if os.path.isdir(SHARED_MEMORY_DIR) and os.access(SHARED_MEMORY_DIR, os.W_OK) else None
+
+def audio_temp_file():
+    return tempfile.NamedTemporaryFile(delete=False, suffix='.wav', dir=AUDIO_TEMP_DIR)
+
+# 14. --- function to generate audio ---
+
+# Function: generate_audio_from_generated_story(story_text, on_progress=None)
+#
+# Purpose:
+#     Converts story text into natural-sounding speech audio file
+#
+# Parameters:
+#     story_text (str) - The story text to convert to speech
+#     on_progress (callable) - Optional, called with the number of seconds
+#                              of audio received so far (after every chunk
+#                              or every finished paragraph)
+#
+# Returns:
+#     str - File path to temporary WAV audio file
+#     None - If generation fails
+#
+# Process Overview:
+#     1. If this story was narrated before, copy the saved WAV file
+#     2. Open a temporary file (in RAM when possible) and reserve 44 bytes
+#        for the WAV header
+#     3. Several paragraphs: narrate all of them in parallel and append
+#        their PCM audio in order, with a short pause in between
+#        One paragraph: stream it and append each PCM chunk as it arrives
+#     4. Report progress so the UI can update while synthesis runs
+#     5. Write the real header (now that the size is known) and close
+#     6. Stream the finished WAV file into result_cache
+#     7. Return file path for playback
+#
+# Technical Challenge Solved:
+#     Gemini returns raw PCM audio (just the samples)
+#     But browsers need WAV format (samples + headers)
+#     This function bridges that gap without holding the full clip in memory
+
+def generate_audio_from_generated_story(story_text: str, on_progress=None):
+    """Narrate the story with Gemini into a WAV file.
+    Paragraphs are synthesized in parallel, raw PCM is written to a temp
+    WAV file (tmpfs when available).
     """
-    try:        
-        response = client.models.generate_content(
-            model=model_name_2,
-            contents=[story_text],
-            config=types.GenerateContentConfig(
-                response_modalities=["AUDIO"],
-                speech_config=types.SpeechConfig(
-                    voice_config=types.VoiceConfig(
-                        prebuilt_voice_config=types.PrebuiltVoiceConfig(
-                            voice_name="Kore"
-                        )
-                    )
-                )
+    temp_file = None
+
+    try:
+        # Saved audio for this exact story: copy the WAV file and skip Gemini
+        # (read=True gives an open file, so the clip is never loaded whole)
+        key = audio_cache_key(story_text)
+        cached_wav = result_cache.get(key, read=True)
+        if cached_wav is not None:
+            with cached_wav, audio_temp_file() as temp_file:
+                shutil.copyfileobj(cached_wav, temp_file)
+            return temp_file.name
+
+        # Gemini returns raw PCM data (audio/L16;codec=pcm;rate=24000)
+        # so a placeholder header is written first and every chunk appended
+        temp_file = audio_temp_file()
+        temp_file.write(wav_header(0))
+        bytes_received = 0
+
+        paragraphs = split_story_paragraphs(story_text)
+
+        if len(story_text) > MAX_TTS_CHARS:
+            logger.warning(
+                "Story is %d characters (TTS limit %d), narrating it in %d pieces",
+                len(story_text), MAX_TTS_CHARS, len(paragraphs)
             )
-        )
 
-        # Extract audio data
-        audio_part = response.candidates[0].content.parts[0]
-        
-        if hasattr(audio_part, 'inline_data'):
-            # audio_data is already bytes (not base64 string)
-            audio_data = audio_part.inline_data.data
-            
-            # Gemini returns raw PCM data (audio/L16;codec=pcm;rate=24000)
-            # We need to wrap it in WAV format
-            
-            # Create a WAV file with proper headers
-            audio_buffer = BytesIO()
-            
-            with wave.open(audio_buffer, 'wb') as wav_file:
-                wav_file.setnchannels(1)        # Mono
-                wav_file.setsampwidth(2)        # 16-bit (L16 = Linear 16-bit PCM)
-                wav_file.setframerate(24000)    # Sample rate from mime_type
-                wav_file.writeframes(audio_data)  # Write raw PCM data
-            
-            # Reset buffer to beginning
-            audio_buffer.seek(0)
-                    
-            # Save to temp file for Streamlit
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
-            temp_file.write(audio_buffer.getvalue())
-            temp_file.flush()
-            temp_file.close()
-            
-            return temp_file.name
+        if len(paragraphs) > 1:
+            # Several paragraphs: narrate them in parallel, join with pauses
+            for audio_data in synthesize_paragraphs(paragraphs, on_progress):
+                if bytes_received:
+                    temp_file.write(PARAGRAPH_PAUSE)
+                    bytes_received += len(PARAGRAPH_PAUSE)
+
+                temp_file.write(audio_data)
+                bytes_received += len(audio_data)
         else:
-            print("❌ No inline_data found in response")
+            # One paragraph: stream it and write chunks as they arrive
+            for chunk in get_client().models.generate_content_stream(
+                model=model_name_2,
+                contents=[story_text],
+                config=TTS_CONFIG
+            ):
+                # Some chunks carry only metadata, skip those
+                audio_data = audio_from_response(chunk)
+                if audio_data is None:
+                    continue
+
+                temp_file.write(audio_data)
+                bytes_received += len(audio_data)
+
+                if on_progress:
+                    on_progress(bytes_received / AUDIO_BYTES_PER_SECOND)
+
+        # Now the PCM size is known, write the real header over the placeholder
+        temp_file.seek(0)
+        temp_file.write(wav_header(bytes_received))
+        temp_file.close()
+
+        if bytes_received == 0:
+            logger.error("No inline_data found in TTS response")
+            os.unlink(temp_file.name)
             return None
 
-    except Exception as e:
-        print(f"❌ Error generating audio: {e}")
-        import traceback
-        traceback.print_exc()
-        return None
+        # Stream the finished file into the cache in blocks
+        with open(temp_file.name, 'rb') as wav_file:
+            result_cache.set(key, wav_file, read=True)
+
+        return temp_file.name
 
+    except Exception:
+        logger.exception("Audio generation failed")
+
+        # Don't leave a half-written WAV behind (it may be in RAM on /dev/shm)
+        if temp_file is not None:
+            temp_file.close()
+            try:
+                os.unlink(temp_file.name)
+            except OSError:
+                pass
+
+        return None
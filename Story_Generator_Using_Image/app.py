@@ -1,4 +1,4 @@
-f="""
+"""
 =============================================================================
 AI STORY GENERATOR - STREAMLIT WEB APPLICATION
 =============================================================================
@@ -56,13 +56,14 @@ WORKFLOW:
     1. User uploads 1-10 images
     2. User selects story genre from dropdown
     3. User clicks "Generate Story" button
-       → Images sent to Gemini AI with genre-specific prompt
+       → Images shrunk to 1024px JPEGs (small ones sent as-is) to Gemini AI
        → AI analyzes images and creates narrative
        → Story displayed in styled card on main page
        → Story saved in session state for persistence
     4. User clicks "Generate Audio" button
-       → Story text sent to Gemini TTS model
-       → Raw PCM audio converted to WAV format
+       → Story split into paragraphs, narrated in parallel by Gemini TTS
+       → PCM audio joined in order with a short pause between paragraphs
+         (a single-paragraph story is streamed chunk by chunk instead)
        → Audio player displayed with narration
        → Temporary file cleaned up after playback
 
@@ -106,57 +107,198 @@ NOTES:
 
 # 1. --- Importing libraries ---
 
-f="""
-1. streamlit (st): Main framework for creating the web interface
-2. PIL.Image: Used to open and process uploaded image files
-3. Story_Generation: Custom module containing AI story and audio generation functions
-4. traceback: For detailed error logging and debugging
-5. os: For file system operations (checking file existence, deleting temp files)
-"""
+# 1. streamlit (st): Main framework for creating the web interface
+#    UploadedFile: Type of uploaded files (used to build cache keys)
+# 2. PIL.Image: Used to open and process uploaded image files
+# 3. Story_Generation: Custom module containing AI story and audio generation functions
+#    (and GENRES, the list of supported story types)
+#    google.genai.types: Wraps image bytes as image Parts for the request
+# 4. traceback: For detailed error logging and debugging
+# 5. os: For file system operations (checking file existence, deleting temp files)
+# 6. ThreadPoolExecutor: Shrinks several uploaded images at the same time
+# 7. BytesIO: In-memory buffer for re-encoding shrunk images as JPEG
+# 8. logging: Sends log messages from Story_Generation to the console
+#    (basicConfig sets up the root logger once, at INFO level)
+# 9. struct: Reads image width/height from JPEG/PNG headers
 
 import streamlit as st
+from streamlit.runtime.uploaded_file_manager import UploadedFile
 from PIL import Image
-from Story_Generation import generate_story_from_images, generate_audio_from_generated_story
+from Story_Generation import GENRES, generate_story_from_images, generate_audio_from_generated_story
+from google.genai import types
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
 import traceback
+import struct
+import logging
 import os
 
-# 2. --- Page Configuration ---
-
-f="""
-Configure the Streamlit page settings:
-1. page_title: Sets the browser tab title
-2. page_icon: Sets the browser tab icon (emoji)
-This must be the first Streamlit command in the script
-"""
+logging.basicConfig(level=logging.INFO)
+
+# 2. --- Image Preparation Helpers ---
+
+# Function: shrink_image(uploaded_image)
+#
+# Purpose:
+#     Makes an uploaded photo small enough to send quickly to Gemini
+#
+# Why?
+#     - Phone photos are often 4000x3000 pixels and 5-10 MB each
+#     - Gemini scales images down internally anyway
+#     - Every extra byte must be uploaded before the story can start
+#
+# Steps:
+#     1. Open the uploaded file with PIL
+#     2. thumbnail() shrinks it so the longest side is at most 1024 px
+#        (keeps the aspect ratio, never makes small images bigger)
+#     3. Convert to RGB (JPEG has no transparency, PNG may have)
+#     4. Re-encode as JPEG quality 85 into an in-memory buffer
+#     5. Return the JPEG bytes (ready to send, no further encoding needed)
+
+MAX_IMAGE_SIDE = 1024
+JPEG_QUALITY = 85
+
+def shrink_image(uploaded_image):
+    img = Image.open(uploaded_image)
+    img.thumbnail((MAX_IMAGE_SIDE, MAX_IMAGE_SIDE), Image.LANCZOS)
+
+    buffer = BytesIO()
+    img.convert("RGB").save(buffer, "JPEG", quality=JPEG_QUALITY, optimize=True)
+
+    return buffer.getvalue()
+
+# Function: image_format_and_size(data)
+#
+# Purpose:
+#     Reads the format, width and height of a JPEG or PNG from its header,
+#     without decoding any pixels
+#
+# How?
+#     - PNG: fixed 8-byte signature, then the IHDR chunk holds width and
+#       height as two big-endian 4-byte numbers (bytes 16-24)
+#     - JPEG: a list of segments (0xFF, marker, 2-byte length, data);
+#       we jump from segment to segment until the SOF ("start of frame")
+#       marker, which holds height and width
+#
+# Returns:
+#     tuple - (mime_type, width, height)
+#     None - If the data is not a JPEG/PNG we can read
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+def image_format_and_size(data):
+    if data[:8] == PNG_SIGNATURE and data[12:16] == b"IHDR":
+        width, height = struct.unpack(">II", data[16:24])
+        return "image/png", width, height
+
+    if data[:2] == b"\xff\xd8":
+        index = 2
+        while index + 9 <= len(data):
+            if data[index] != 0xFF:
+                return None
+
+            marker = data[index + 1]
+            if marker == 0xFF:
+                # Padding byte before a marker
+                index += 1
+                continue
+
+            if marker in JPEG_SOF_MARKERS:
+                height, width = struct.unpack(">HH", data[index + 5:index + 9])
+                return "image/jpeg", width, height
+
+            if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+                # Markers without a length field
+                index += 2
+                continue
+
+            segment_length = struct.unpack(">H", data[index + 2:index + 4])[0]
+            index += 2 + segment_length
+
+    return None
+
+# Function: image_part(uploaded_image)
+#
+# Purpose:
+#     Turns one uploaded file into a Gemini image Part
+#
+# Steps:
+#     1. Small files (under 2 MB) that are already at most 1024 px are
+#        sent as they are - no decode, no re-encode
+#     2. Everything else goes through shrink_image() and is sent as JPEG
+
+PASSTHROUGH_MAX_BYTES = 2_000_000
+
+def image_part(uploaded_image):
+    data = uploaded_image.getvalue()
+
+    if len(data) < PASSTHROUGH_MAX_BYTES:
+        image_info = image_format_and_size(data)
+        if image_info and max(image_info[1], image_info[2]) <= MAX_IMAGE_SIDE:
+            return types.Part.from_bytes(data=data, mime_type=image_info[0])
+
+    return types.Part.from_bytes(data=shrink_image(uploaded_image), mime_type="image/jpeg")
+
+# Function: prepare_image_parts(uploaded_images)
+#
+# Purpose:
+#     Turns all uploaded images into Gemini image Parts,
+#     but only once per set of uploads
+#
+# Why @st.cache_data?
+#     - Streamlit re-runs this whole script on every click or selection
+#     - Without caching, every "Generate Story" click decodes and
+#       re-encodes the same photos again
+#     - The cache key uses each file's file_id (given by Streamlit per
+#       upload) instead of hashing megabytes of image bytes
+#
+# Why types.Part.from_bytes?
+#     - The image bytes are sent exactly as we have them
+#     - The SDK does not have to convert PIL images again
+#     - The MIME type is set explicitly (image/jpeg or image/png)
+#
+# Steps:
+#     1. One worker thread per uploaded image
+#     2. Each worker runs image_part() (pass-through or shrink)
+#     3. PIL releases the GIL while decoding/encoding, so threads
+#        really run at the same time
+#     4. executor.map keeps the original upload order
+
+@st.cache_data(hash_funcs={UploadedFile: lambda uploaded_file: uploaded_file.file_id}, show_spinner=False)
+def prepare_image_parts(uploaded_images):
+    with ThreadPoolExecutor(max_workers=len(uploaded_images)) as executor:
+        return list(executor.map(image_part, uploaded_images))
+
+# 3. --- Page Configuration ---
+
+# Configure the Streamlit page settings:
+# 1. page_title: Sets the browser tab title
+# 2. page_icon: Sets the browser tab icon (emoji)
+# This must be the first Streamlit command in the script
 
 st.set_page_config(
     page_title="AI Story Generator 🎭",
     page_icon="📖"
 )
 
-# 3. --- Sidebar ---
+# 4. --- Sidebar ---
 
-f="""
-The sidebar contains all user input controls:
-- Image uploader
-- Story type selector
-- Action buttons
-"""
+# The sidebar contains all user input controls:
+# - Image uploader
+# - Story type selector
+# - Action buttons
 
-f="""
-Creates a header in the sidebar to organize the input controls
-"""
+# Creates a header in the sidebar to organize the input controls
 
 st.sidebar.header("✨ Story Generator Settings")
 
-# 4. --- Upload images ---
+# 5. --- Upload images ---
 
-f="""
-File uploader widget that:
-1. Accepts only image files (jpg, jpeg, png)
-2. Allows multiple file uploads
-3. Returns a list of uploaded files or None if nothing uploaded
-"""
+# File uploader widget that:
+# 1. Accepts only image files (jpg, jpeg, png)
+# 2. Allows multiple file uploads
+# 3. Returns a list of uploaded files or None if nothing uploaded
 
 uploaded_images = st.sidebar.file_uploader(
     "Upload 1-10 images (JPG, JPEG, or PNG):",
@@ -164,78 +306,58 @@ uploaded_images = st.sidebar.file_uploader(
     accept_multiple_files=True
 )
 
-# 5. --- Limit the number of uploaded images ---
+# 6. --- Limit the number of uploaded images ---
 
-f="""
-Validation logic:
-1. Check if user uploaded any images AND if count exceeds 10
-2. Show warning message if limit exceeded
-3. Truncate the list to only first 10 images
-This prevents API overload and maintains performance
-"""
+# Validation logic:
+# 1. Check if user uploaded any images AND if count exceeds 10
+# 2. Show warning message if limit exceeded
+# 3. Truncate the list to only first 10 images
+# This prevents API overload and maintains performance
 
 if uploaded_images and len(uploaded_images) > 10:
     st.sidebar.warning("⚠️ You can upload a maximum of 10 images only!")
     uploaded_images = uploaded_images[:10]
 
-# 6. --- Choose story type ---
+# 7. --- Choose story type ---
 
-f="""
-Dropdown menu for selecting story genre:
-1. Provides 10 different story types
-2. Returns selected value as string
-3. Default selection is "Comedy" (first in list)
-"""
+# Dropdown menu for selecting story genre:
+# 1. Provides 10 different story types (GENRES from Story_Generation.py,
+#    the same list its prompts are prepared for)
+# 2. Returns selected value as string
+# 3. Default selection is "Comedy" (first in list)
 
 story_type = st.sidebar.selectbox(
     "Select Story Type:",
-    [
-        "Comedy",
-        "Thriller",
-        "Moral",
-        "Horror",
-        "Emotional",
-        "Adventurous",
-        "Action",
-        "Mysterious",
-        "Fantasy",
-        "Fairy Tale"
-    ]
+    GENRES
 )
 
-# 7. --- Generate button ---
+# 8. --- Generate button ---
 
-f="""
-Two buttons for triggering different actions:
-1. generate_button: Returns True when clicked, False otherwise
-2. generate_audio_button: Returns True when clicked, False otherwise
-These buttons trigger their respective code blocks below
-"""
+# Two buttons for triggering different actions:
+# 1. generate_button: Returns True when clicked, False otherwise
+# 2. generate_audio_button: Returns True when clicked, False otherwise
+# These buttons trigger their respective code blocks below
 
 generate_button = st.sidebar.button("✨ Generate Story")
 generate_audio_button = st.sidebar.button("🔊 Generate Audio from Story")
 
-# 8. --- Main Content Area ---
+# 9. --- Main Content Area ---
 
-f="""
-Main page content displayed in the center of the screen:
-1. Title using large heading (st.title)
-2. Description text explaining the app functionality
-"""
+# Main page content displayed in the center of the screen:
+# 1. Title using large heading (st.title)
+# 2. Description text explaining the app functionality
 
 st.title("📖 AI Story Generator from Images")
 st.write("Upload your images, choose a story type, and let AI craft a unique story and audio for you! 🚀")
 
-# 9. --- Display uploaded images ---
+# 10. --- Display uploaded images ---
 
-f="""
-If user has uploaded images, display them in a grid:
-1. Check if uploaded_images exists and is not empty
-2. Create a subheader
-3. Create 5 columns for grid layout
-4. Loop through each image and display in columns (wraps to next row after 5)
-5. use_container_width=True makes images responsive to column width
-"""
+# If user has uploaded images, display them in a grid:
+# 1. Check if uploaded_images exists and is not empty
+# 2. Create a subheader
+# 3. Create 5 columns for grid layout
+# 4. Loop through each image and display in columns (wraps to next row after 5)
+# 5. use_container_width=True makes images responsive to column width
 
 if uploaded_images:
     st.subheader("🖼️ Uploaded Images:")
@@ -244,115 +366,91 @@ if uploaded_images:
         with cols[idx % 5]:
             st.image(img, use_container_width=True)
 
-# 10. --- Story Generation Logic ---
+# 11. --- Story Generation Logic ---
 
-f="""
-This block executes ONLY when "Generate Story" button is clicked:
-1. Validate that images are uploaded
-2. Show loading spinner during generation
-3. Convert uploaded files to PIL Image objects
-4. Call AI generation function
-5. Store result in session state for persistence
-6. Handle any errors that occur
-"""
+# This block executes ONLY when "Generate Story" button is clicked:
+# 1. Validate that images are uploaded
+# 2. Show loading spinner during generation
+# 3. Convert uploaded files to small image Parts
+# 4. Call AI generation function
+# 5. Store result in session state for persistence
+# 6. Handle any errors that occur
 
 if generate_button:
 
-    f="""
-    If no images uploaded, show warning and stop execution
-    """
+    # If no images uploaded, show warning and stop execution
     if not uploaded_images:
         st.warning("Please upload at least one image before generating the story.")
 
     else:
-        f="""
-        Wraps the generation logic to catch and display any errors gracefully
-        """
+        # Wraps the generation logic to catch and display any errors gracefully
 
         try:
-            f="""
-            Shows animated spinner with custom message while code inside executes
-            f-string formats story_type and image count into message
-            """
+            # Shows animated spinner with custom message while code inside executes
+            # f-string formats story_type and image count into message
 
             with st.spinner(f"Generating a **{story_type}** story based on {len(uploaded_images)} image(s) wait few minutes... ⏳"):
 
-                f="""
-                List comprehension that:
-                1. Loops through each uploaded_image file
-                2. Opens it using PIL.Image.open()
-                3. Creates a list of PIL Image objects
-                These objects are required by the AI model
-                """
-                pil_images = [Image.open(uploaded_image) for uploaded_image in uploaded_images]
-
-                f="""
-                Calls custom function from Story_Generation.py:
-                - Input: list of PIL images + story type string
-                - Output: generated story text as string
-                - This makes API call to Google Gemini AI
-                """
-                generated_story = generate_story_from_images(pil_images, story_type)
-
-                f="""
-                Check if story was successfully generated:
-                - If empty/None: show error
-                - If valid: save to session state
-                """
+                # Prepares every uploaded image in parallel (cached across reruns):
+                # - tuple() makes the list hashable for st.cache_data
+                # These small image Parts are sent to the AI model
+                image_parts = prepare_image_parts(tuple(uploaded_images))
+
+                # Calls custom function from Story_Generation.py:
+                # - Input: list of image Parts + story type string
+                # - Output: generated story text as string
+                # - This makes API call to Google Gemini AI
+                generated_story = generate_story_from_images(image_parts, story_type)
+
+                # Check if story was successfully generated:
+                # - If empty/None: show error
+                # - If valid: save to session state
                 if not generated_story:
                     st.error("⚠️ No story generated. Please try again.")
                 else:
                     # SAVE TO SESSION so audio can access it later
 
-                    f="""
-                    st.session_state is a dictionary that persists data across reruns:
-                    - Key: "generated_story"
-                    - Value: the generated story text
-                    - This allows audio generation button to access the story later
-                    - Data persists even after page interactions/reruns
-                    """
+                    # st.session_state is a dictionary that persists data across reruns:
+                    # - Key: "generated_story"
+                    # - Value: the generated story text
+                    # - This allows audio generation button to access the story later
+                    # - Data persists even after page interactions/reruns
                     st.session_state["generated_story"] = generated_story
 
-            f="""
-            If any error occurs in the try block:
-            1. Catch the exception as variable 'e'
-            2. Display error message with details
-            3. str(e) converts exception to readable string
-            """
+            # If any error occurs in the try block:
+            # 1. Catch the exception as variable 'e'
+            # 2. Display error message with details
+            # 3. str(e) converts exception to readable string
         except Exception as e:
             st.error(f"❌ An error occurred during story generation:\n\n**{str(e)}**")
 
-# 11. --- Always show story if exists ---
+# 12. --- Always show story if exists ---
 
-f="""
-This section displays the story WHENEVER it exists in session state:
-1. Checks if "generated_story" key exists in session state
-2. If yes, displays it in a styled card using custom HTML/CSS
-3. Persists across page interactions (unlike variables which reset)
-"""
+# This section displays the story WHENEVER it exists in session state:
+# 1. Checks if "generated_story" key exists in session state
+# 2. If yes, displays it in a styled card using custom HTML/CSS
+# 3. Persists across page interactions (unlike variables which reset)
 
 if "generated_story" in st.session_state:
 
-    f="""
-    st.markdown with unsafe_allow_html=True allows custom HTML/CSS:
-    
-    f-string formatting:
-    - {'story_type'}: Inserts selected story type into heading
-    - {st.session_state["generated_story"].replace('\\n', '<br>')}: 
-      * Gets story from session state
-      * Replaces line breaks with HTML <br> tags
-      * Preserves formatting in HTML
-    
-    CSS styling:
-    - background-color: Dark theme background
-    - padding: Space inside the card
-    - border-radius: Rounded corners
-    - box-shadow: Drop shadow for depth
-    - border-left: Colored accent bar on left
-    - line-height: Space between text lines
-    - font-size: Text size
-    - font-family: Professional fonts
-    """
+    # st.markdown with unsafe_allow_html=True allows custom HTML/CSS:
+    #
+    # f-string formatting:
+    # - {'story_type'}: Inserts selected story type into heading
+    # - {st.session_state["generated_story"].replace('\\n', '<br>')}:
+    #   * Gets story from session state
+    #   * Replaces line breaks with HTML <br> tags
+    #   * Preserves formatting in HTML
+    #
+    # CSS styling:
+    # - background-color: Dark theme background
+    # - padding: Space inside the card
+    # - border-radius: Rounded corners
+    # - box-shadow: Drop shadow for depth
+    # - border-left: Colored accent bar on left
+    # - line-height: Space between text lines
+    # - font-size: Text size
+    # - font-family: Professional fonts
 
     st.markdown(
         f"""
@@ -373,82 +471,68 @@ if "generated_story" in st.session_state:
         unsafe_allow_html=True
     )
 
-# 12. --- Audio Generation Logic ---
+# 13. --- Audio Generation Logic ---
 
-f="""
-This block executes ONLY when "Generate Audio" button is clicked:
-1. Validates that a story exists
-2. Calls audio generation function
-3. Saves audio to temporary file
-4. Displays audio player
-5. Cleans up temporary file
-6. Handles errors
-"""
+# This block executes ONLY when "Generate Audio" button is clicked:
+# 1. Validates that a story exists
+# 2. Calls audio generation function
+# 3. Saves audio to temporary file
+# 4. Displays audio player straight from the file path
+# 5. Cleans up temporary file
+# 6. Handles errors
 
 if generate_audio_button:
 
-    f="""
-    Audio can only be generated from existing story text:
-    - If no story in session state: show warning
-    - If story exists: proceed with audio generation
-    """
+    # Audio can only be generated from existing story text:
+    # - If no story in session state: show warning
+    # - If story exists: proceed with audio generation
 
     if "generated_story" not in st.session_state:
         st.warning("⚠️ Please generate a story first before creating audio.")
     else:
-        f="""
-        Wraps audio generation logic to catch and display errors
-        """
+        # Wraps audio generation logic to catch and display errors
 
         try:
-            f="""
-            Shows spinner while audio is being generated
-            Audio generation can take 10-30 seconds
-            """
+            # Shows spinner while audio is being generated
+            # Audio generation can take 10-30 seconds
 
             with st.spinner("🎤 Generating audio narration... please wait few minutes."):
                 
-                f="""
-                Calls function from Story_Generation.py:
-                - Input: story text from session state
-                - Output: file path to temporary WAV file
-                - Makes API call to Google Gemini TTS
-                - Converts PCM audio to WAV format
-                """
-                audio_path = generate_audio_from_generated_story(st.session_state["generated_story"])
-
-                f="""
-                Check if audio file was created successfully:
-                1. audio_path exists (not None)
-                2. File exists at that path (os.path.exists checks filesystem)
-                """
+                # Placeholder that is updated while narration comes in:
+                # - st.empty() reserves one slot on the page
+                # - Each call to .caption() replaces the previous text
+                # - Cleared once the full narration is ready
+                progress_placeholder = st.empty()
+
+                # Calls function from Story_Generation.py:
+                # - Input: story text from session state
+                # - on_progress: shows how many seconds of narration arrived so far
+                # - Output: file path to temporary WAV file
+                # - Paragraphs are narrated in parallel by Google Gemini TTS and
+                #   joined into one WAV file with a short pause in between
+                # - A single-paragraph story is streamed chunk by chunk instead
+                audio_path = generate_audio_from_generated_story(
+                    st.session_state["generated_story"],
+                    on_progress=lambda seconds: progress_placeholder.caption(f"🎧 {seconds:.0f}s of narration received...")
+                )
+                progress_placeholder.empty()
+
+                # Check if audio file was created successfully:
+                # 1. audio_path exists (not None)
+                # 2. File exists at that path (os.path.exists checks filesystem)
                 if audio_path and os.path.exists(audio_path):
 
                     # Check file size
-                    f="""
-                    os.path.getsize returns file size in bytes
-                    Commented out display, but useful for debugging
-                    Expected size: 2-5 MB for typical story
-                    """
+                    # os.path.getsize returns file size in bytes
+                    # Commented out display, but useful for debugging
+                    # Expected size: 2-5 MB for typical story
                     file_size = os.path.getsize(audio_path)
                     
-                    # Read the file and create BytesIO
-                    f="""
-                    1. Open file in binary read mode ('rb')
-                    2. Read entire file content as bytes
-                    3. Store in audio_bytes variable
-                    4. 'with' statement automatically closes file after reading
-                    """
-                    with open(audio_path, 'rb') as f:
-                        audio_bytes = f.read()
-                    
                     # Determine format from file extension
-                    f="""
-                    Check file extension to set correct MIME type:
-                    - .mp3 → "audio/mp3"
-                    - .wav → "audio/wav"
-                    - default → "audio/wav" (our function returns .wav)
-                    """
+                    # Check file extension to set correct MIME type:
+                    # - .mp3 → "audio/mp3"
+                    # - .wav → "audio/wav"
+                    # - default → "audio/wav" (our function returns .wav)
                     if audio_path.endswith('.mp3'):
                         audio_format = "audio/mp3"
                     elif audio_path.endswith('.wav'):
@@ -456,41 +540,34 @@ if generate_audio_button:
                     else:
                         audio_format = "audio/wav"  # default
                     
-                    f="""
-                    st.audio creates embedded audio player:
-                    - Input: audio file bytes
-                    - format: tells browser how to decode the audio
-                    - Browser renders play/pause controls
-                    """
-                    st.audio(audio_bytes, format=audio_format)
+                    # st.audio creates embedded audio player:
+                    # - Input: path to the WAV file (Streamlit reads it into
+                    #   its own media storage right away)
+                    # - format: tells browser how to decode the audio
+                    # - Browser renders play/pause controls
+                    st.audio(audio_path, format=audio_format)
                     st.success("✅ Audio narration generated successfully!")
                     
                     # Clean up temp file
-                    f="""
-                    Delete temporary audio file from disk:
-                    1. try-except prevents errors if file already deleted
-                    2. os.unlink() deletes the file
-                    3. Frees up disk space
-                    4. pass means "do nothing" if deletion fails
-                    """
+                    # Delete temporary audio file from disk:
+                    # 1. try-except prevents errors if file already deleted
+                    # 2. os.unlink() deletes the file
+                    # 3. Frees up disk space (or RAM, when it lives in /dev/shm)
+                    # 4. pass means "do nothing" if deletion fails
                     try:
                         os.unlink(audio_path)
-                    except:
+                    except OSError:
                         pass
                 else:
-                    f="""
-                    If function returned None or file doesn't exist:
-                    - Show error message
-                    - Prompt user to check console for details
-                    """
+                    # If function returned None or file doesn't exist:
+                    # - Show error message
+                    # - Prompt user to check console (logs) for details
                     st.error("⚠️ Failed to generate audio. Check the console for details.")
 
-            f="""
-            If any error occurs in the try block:
-            1. Display error message with exception details
-            2. Show full traceback for debugging
-            3. st.code displays formatted code/error text
-            """
+            # If any error occurs in the try block:
+            # 1. Display error message with exception details
+            # 2. Show full traceback for debugging
+            # 3. st.code displays formatted code/error text
         except Exception as e:
             st.error(f"❌ An unexpected error occurred while generating audio:\n\n**{str(e)}**")
             st.code(traceback.format_exc())